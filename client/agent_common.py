@@ -0,0 +1,122 @@
+# Shared by chat_cli.py and run_agent.py: env, pooled clients, JSON helpers, model call.
+from __future__ import annotations
+
+import os
+import json
+from typing import TYPE_CHECKING
+
+from dotenv import load_dotenv
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+# openai/httpx are imported on first use, keeping their import cost off startup.
+if TYPE_CHECKING:
+    import httpx
+    from openai import OpenAI
+
+# -----------------------
+# Load env
+# -----------------------
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+load_dotenv(os.path.join(ROOT, ".env"))
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+FUSION_URL = os.getenv("FUSION_BRIDGE_URL", "http://127.0.0.1:18080")
+FUSION_TOKEN = os.getenv("FUSION_BRIDGE_TOKEN", "")
+
+MODEL = "gpt-4.1-mini"
+
+# -----------------------
+# Clients
+# -----------------------
+_openai_client: OpenAI | None = None
+
+def get_openai() -> OpenAI:
+    global _openai_client
+    if _openai_client is None:
+        from openai import OpenAI
+
+        _openai_client = OpenAI(api_key=OPENAI_API_KEY)
+    return _openai_client
+
+# One pooled client for the whole session so bridge calls reuse keep-alive sockets
+# instead of paying a fresh TCP handshake per tool call.
+_HTTP: httpx.AsyncClient | None = None
+
+def get_http() -> httpx.AsyncClient:
+    global _HTTP
+    if _HTTP is None:
+        import httpx
+
+        _HTTP = httpx.AsyncClient(
+            base_url=FUSION_URL,
+            headers={"X-Token": FUSION_TOKEN},
+            # Some features (pattern/combine/gear) can take longer; the bridge allows gears up to 180 s
+            timeout=httpx.Timeout(190.0),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _HTTP
+
+async def close_http() -> None:
+    global _HTTP
+    if _HTTP is not None:
+        await _HTTP.aclose()
+        _HTTP = None
+
+# -----------------------
+# JSON helpers
+# -----------------------
+# Tool results are read by the model, not people: no whitespace, fewer tokens.
+_COMPACT = (",", ":")
+
+def dumps(obj, sort_keys: bool = False) -> str:
+    """Compact JSON text (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+    return json.dumps(obj, separators=_COMPACT, sort_keys=sort_keys)
+
+def loads(text: str):
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+def first_json_object(s: str) -> str | None:
+    """Return the first balanced {...} in `s` (braces inside strings ignored), or None."""
+    start = -1
+    depth = 0
+    in_string = escape = False
+    for i, ch in enumerate(s):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"' and depth:
+            in_string = True
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                return s[start : i + 1]
+    return None
+
+# -----------------------
+# Model call
+# -----------------------
+def model_reply(input_items: list, prev_id: str | None = None) -> tuple[str, str]:
+    """Return the model's reply text and the response id the next call chains on.
+
+    Not streamed: only a completed response can be chained via previous_response_id,
+    so stopping a stream early saves nothing. Starting the tool call as soon as the JSON
+    object closes (while the stream drains) was also rejected: the reply is a single
+    small object, so the tail it would overlap is a few tokens, not worth a second parser.
+    """
+    kwargs = {"previous_response_id": prev_id} if prev_id else {}
+    resp = get_openai().responses.create(model=MODEL, input=input_items, **kwargs)
+    return resp.output_text.strip(), resp.id
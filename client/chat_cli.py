@@ -1,47 +1,68 @@
 # E:\FusionAgenticCAD\client\chat_cli.py
-import os
+from __future__ import annotations
+
 import json
 import asyncio
-import httpx
-from dotenv import load_dotenv
-from openai import OpenAI
-
-# -----------------------
-# Load env
-# -----------------------
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-load_dotenv(os.path.join(ROOT, ".env"))
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-FUSION_URL = os.getenv("FUSION_BRIDGE_URL", "http://127.0.0.1:18080")
-FUSION_TOKEN = os.getenv("FUSION_BRIDGE_TOKEN", "")
+import time
+from typing import Awaitable, Callable
+
+from agent_common import (
+    FUSION_TOKEN,
+    OPENAI_API_KEY,
+    close_http,
+    dumps,
+    first_json_object,
+    get_http,
+    loads,
+    model_reply,
+)
 
 if not OPENAI_API_KEY:
     raise RuntimeError("Missing OPENAI_API_KEY in .env")
 if not FUSION_TOKEN:
     raise RuntimeError("Missing FUSION_BRIDGE_TOKEN in .env")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
-
 # -----------------------
 # FusionBridge helpers
 # -----------------------
-async def fusion_get(path: str) -> dict:
-    async with httpx.AsyncClient(timeout=60.0) as s:
-        r = await s.get(f"{FUSION_URL}{path}", headers={"X-Token": FUSION_TOKEN})
-        r.raise_for_status()
-        return r.json()
+_RETRY_ATTEMPTS = 3
+
+async def _request(method: str, path: str, idempotent: bool, **kwargs) -> dict:
+    """Send one bridge request, retrying transient failures with exponential backoff.
+
+    Connect errors and 503 (bridge queue full) mean nothing ran, so any call is retried.
+    Read errors are retried only for idempotent calls, since a mutation may already have run.
+    """
+    import httpx
+
+    for attempt in range(_RETRY_ATTEMPTS):
+        last = attempt == _RETRY_ATTEMPTS - 1
+        try:
+            r = await get_http().request(method, path, **kwargs)
+        except httpx.ConnectError:
+            if last:
+                raise
+        except httpx.ReadError:
+            if last or not idempotent:
+                raise
+        else:
+            if r.status_code != 503 or last:
+                r.raise_for_status()
+                return r.json()
+        await asyncio.sleep(0.1 * 2 ** attempt)
+
+async def fusion_get(path: str, args: dict | None = None) -> dict:
+    # GET tools take their (optional) args as query params, lists comma-joined.
+    params = {k: ",".join(map(str, v)) if isinstance(v, list) else v for k, v in (args or {}).items()}
+    return await _request("GET", path, idempotent=True, params=params)
 
 async def fusion_tool(tool: str, args: dict | None = None) -> dict:
-    # Some features (pattern/combine/gear) can take longer
-    async with httpx.AsyncClient(timeout=120.0) as s:
-        r = await s.post(
-            f"{FUSION_URL}/tool",
-            headers={"X-Token": FUSION_TOKEN},
-            json={"tool": tool, "args": args or {}},
-        )
-        r.raise_for_status()
-        return r.json()
+    return await _request(
+        "POST",
+        "/tool",
+        idempotent=tool in _READ_ONLY_BRIDGE_TOOLS,
+        json={"tool": tool, "args": args or {}},
+    )
 
 # -----------------------
 # Tool routing (LLM tool_name -> FusionBridge tool string)
@@ -67,9 +88,15 @@ TOOL_ROUTER = {
     "fusion_extrude_profile": ("POST", "extrude_profile"),
     "fusion_revolve_profile": ("POST", "revolve_profile"),
 
+    # Primitives (sketch + extrude in one call)
+    "fusion_box": ("POST", "box"),
+    "fusion_cylinder": ("POST", "cylinder"),
+    "fusion_tube": ("POST", "tube"),
+
     # Hole + pattern
     "fusion_hole_on_last_body_top_face": ("POST", "hole_on_last_body_top_face"),
     "fusion_hole_bolt_circle_one": ("POST", "hole_bolt_circle_one"),
+    "fusion_hole_bolt_circle": ("POST", "hole_bolt_circle"),
     "fusion_circular_pattern_last_feature": ("POST", "circular_pattern_last_feature"),
     "fusion_countersink_hole_on_last_body_top_face": ("POST", "countersink_hole_on_last_body_top_face"),
 
@@ -94,6 +121,16 @@ TOOL_ROUTER = {
     "fusion_create_bevel_gear": ("POST", "create_bevel_gear"),
 }
 
+# Read-only tools that may be dispatched together in one {"action":"tools"} batch.
+CONCURRENCY_SAFE = {
+    "fusion_ping",
+    "fusion_get_state",
+    "fusion_list_bodies",
+    "fusion_get_last_body",
+}
+# Bridge-side names of the read-only POST tools; safe to resend after a read error.
+_READ_ONLY_BRIDGE_TOOLS = {TOOL_ROUTER[t][1] for t in CONCURRENCY_SAFE if TOOL_ROUTER[t][0] == "POST"}
+
 # -----------------------
 # Strong system prompt to prevent tool name drift
 # -----------------------
@@ -101,12 +138,18 @@ SYSTEM = f"""You are a CAD agent controlling Autodesk Fusion 360 through tools.
 
 You MUST respond with ONLY valid JSON (no extra text, no markdown) with this schema:
 {{
-  "action": "tool" | "final",
+  "action": "tool" | "tools" | "final",
   "tool_name": string | null,
   "args": object | null,
+  "tools": [{{"tool_name": string, "args": object}}] | null,
   "message": string
 }}
 
+Use action:"tools" ONLY to run several read-only queries at once; every tool_name in
+"tools" must be one of:
+{json.dumps(sorted(CONCURRENCY_SAFE), indent=2)}
+Their results come back together, in the same order, as one tool_results list.
+
 You may ONLY request ONE of these tool_name values (exact spelling):
 {json.dumps(sorted(TOOL_ROUTER.keys()), indent=2)}
 
@@ -117,7 +160,7 @@ Tool argument schemas:
 
 Basics:
 - fusion_ping: {{}}
-- fusion_get_state: {{}}
+- fusion_get_state: {{}} or {{"fields": ["designName"|"defaultLengthUnits"|"parameters"|"bodies"|"timeline", ...]}} to fetch only some sections
 
 Sketch tools:
 - fusion_create_sketch_on_plane: {{"plane":"XY"|"XZ"|"YZ"}}
@@ -134,14 +177,20 @@ Solid feature tools:
 - fusion_extrude_profile: {{"sketch_index_from_end": integer, "profile_index": integer, "distance_mm": number, "operation":"newBody"|"join"|"cut"|"intersect"}}
 - fusion_revolve_profile: {{"sketch_index_from_end": integer, "profile_index": integer, "axis_line_index": integer, "angle_deg": number}}
 
+Primitive tools (one call = sketch + new-body extrude; prefer these for plain solids):
+- fusion_box: {{"x_mm": number, "y_mm": number, "z_mm": number, "plane":"XY"|"XZ"|"YZ"}}
+- fusion_cylinder: {{"r_mm": number, "height_mm": number, "cx_mm": number, "cy_mm": number, "plane":"XY"|"XZ"|"YZ"}}
+- fusion_tube: {{"od_mm": number, "id_mm": number, "height_mm": number, "plane":"XY"|"XZ"|"YZ"}}
+
 Holes + pattern tools:
 - fusion_hole_on_last_body_top_face: {{"dia_mm": number, "depth_mm": number, "x_mm": number, "y_mm": number}}
 - fusion_hole_bolt_circle_one: {{"bcd_mm": number, "hole_dia_mm": number, "depth_mm": number, "angle_deg": number}}
+- fusion_hole_bolt_circle: {{"qty": integer, "bcd_mm": number, "hole_dia_mm": number, "depth_mm": number, "start_angle_deg": number}} (all holes in one feature; prefer this over repeated fusion_hole_bolt_circle_one)
 - fusion_circular_pattern_last_feature: {{"qty": integer, "angle": "360 deg" or similar}}
 - fusion_countersink_hole_on_last_body_top_face: {{"hole_dia_mm": number, "cs_dia_mm": number, "cs_angle_deg": number, "depth_mm": number, "x_mm": number, "y_mm": number}}
 
 Query helpers:
-- fusion_list_bodies: {{}}
+- fusion_list_bodies: {{"include_bbox": bool}}  (bbox is skipped unless include_bbox is true)
 - fusion_get_last_body: {{}}
 
 Cleanup / utility:
@@ -181,55 +230,110 @@ Rules:
 
 def _parse_json_only(text: str) -> dict:
     text = (text or "").strip()
-    # If the model accidentally adds surrounding text, try to extract first JSON object.
-    if not text.startswith("{"):
-        i = text.find("{")
-        j = text.rfind("}")
-        if i != -1 and j != -1 and j > i:
-            text = text[i : j + 1]
-    return json.loads(text)
+    # If the model accidentally adds surrounding text (or a code fence), keep only the first object.
+    return loads(first_json_object(text) or text)
 
-async def _execute_tool(tool_name: str, args: dict) -> dict:
-    if tool_name not in TOOL_ROUTER:
-        return {"ok": False, "error": f"Tool not allowed: {tool_name}"}
 
-    kind = TOOL_ROUTER[tool_name]
-    if kind[0] == "GET":
-        return await fusion_get(kind[1])
+# Short-lived cache for idempotent queries (seconds). Any mutating tool purges it.
+_IDEMPOTENT_TTL = {"fusion_ping": 5.0, "fusion_get_state": 0.75}
+_CACHE: dict[tuple, tuple[float, dict]] = {}
 
-    # POST tool
-    return await fusion_tool(kind[1], args)
+def _route(method: str, target: str) -> Callable[[dict], Awaitable[dict]]:
+    if method == "GET":
+        return lambda args: fusion_get(target, args)
+    return lambda args: fusion_tool(target, args)
 
-async def agent_turn(user_text: str, messages: list) -> tuple[str, list]:
+# LLM tool_name -> coroutine function, built once from TOOL_ROUTER.
+_DISPATCH: dict[str, Callable[[dict], Awaitable[dict]]] = {
+    name: _route(method, target) for name, (method, target) in TOOL_ROUTER.items()
+}
+
+async def _execute_tool(tool_name: str, args: dict) -> dict:
+    fn = _DISPATCH.get(tool_name)
+    if fn is None:
+        return {"ok": False, "error": f"Tool not allowed: {tool_name}"}
+
+    ttl = _IDEMPOTENT_TTL.get(tool_name)
+    if ttl is not None:
+        key = (tool_name, dumps(args, sort_keys=True))
+        hit = _CACHE.get(key)
+        if hit and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+    elif tool_name not in CONCURRENCY_SAFE:
+        # Geometry may change (even if the call fails midway); never serve a stale state.
+        _CACHE.clear()
+
+    result = await fn(args)
+
+    if ttl is not None and result.get("ok"):
+        _CACHE[key] = (time.monotonic(), result)
+    return result
+
+async def agent_turn(
+    user_text: str, messages: list, prev_id: str | None = None
+) -> tuple[str, list, str | None]:
+    """Run one user turn. `messages` is a local transcript only; the server keeps
+    the conversation, so each call sends just the new message chained on `prev_id`."""
     messages.append({"role": "user", "content": user_text})
+    pending = messages if prev_id is None else messages[-1:]
 
     for _ in range(12):
-        resp = client.responses.create(
-            model="gpt-4.1-mini",
-            input=messages,
-        )
-        raw = (resp.output_text or "").strip()
+        raw, prev_id = model_reply(pending, prev_id)
 
         try:
             cmd = _parse_json_only(raw)
         except Exception as e:
             messages.append({"role": "assistant", "content": raw})
-            return f"Model did not return valid JSON.\nRaw:\n{raw}\nError: {e}", messages
+            return f"Model did not return valid JSON.\nRaw:\n{raw}\nError: {e}", messages, prev_id
 
-        messages.append({"role": "assistant", "content": json.dumps(cmd)})
+        messages.append({"role": "assistant", "content": dumps(cmd)})
 
         action = cmd.get("action")
         if action == "final":
-            return cmd.get("message", ""), messages
+            return cmd.get("message", ""), messages, prev_id
+
+        if action == "tools":
+            calls = cmd.get("tools") or []
+            if not calls:
+                return f"Missing tools in: {cmd}", messages, prev_id
+            if not isinstance(calls, list) or not all(
+                isinstance(t, dict) and isinstance(t.get("tool_name"), str) for t in calls
+            ):
+                return f'Each entry in "tools" must be an object with a string tool_name: {cmd}', messages, prev_id
+            unsafe = [t.get("tool_name") for t in calls if t.get("tool_name") not in CONCURRENCY_SAFE]
+            if unsafe:
+                return f"Tools not allowed in a batch: {unsafe}", messages, prev_id
+
+            # Independent read-only queries: run them concurrently, keep input order.
+            outs = await asyncio.gather(
+                *[_execute_tool(t["tool_name"], t.get("args") or {}) for t in calls],
+                return_exceptions=True,
+            )
+            results = [
+                {
+                    "tool_name": t["tool_name"],
+                    "args": t.get("args") or {},
+                    "result": {"ok": False, "error": str(out)} if isinstance(out, Exception) else out,
+                }
+                for t, out in zip(calls, outs)
+            ]
+            messages.append(
+                {
+                    "role": "user",
+                    "content": dumps({"tool_results": results}),
+                }
+            )
+            pending = messages[-1:]
+            continue
 
         if action != "tool":
-            return f"Unknown action: {cmd}", messages
+            return f"Unknown action: {cmd}", messages, prev_id
 
         tool_name = cmd.get("tool_name")
         args = cmd.get("args") or {}
 
         if not tool_name:
-            return f"Missing tool_name in: {cmd}", messages
+            return f"Missing tool_name in: {cmd}", messages, prev_id
 
         # Execute tool
         try:
@@ -241,23 +345,24 @@ async def agent_turn(user_text: str, messages: list) -> tuple[str, list]:
         messages.append(
             {
                 "role": "user",
-                "content": json.dumps(
+                "content": dumps(
                     {
                         "tool_result": {
                             "tool_name": tool_name,
                             "args": args,
                             "result": result,
                         }
-                    },
-                    indent=2,
+                    }
                 ),
             }
         )
+        pending = messages[-1:]
 
-    return "Max steps reached without finishing.", messages
+    return "Max steps reached without finishing.", messages, prev_id
 
 async def main():
     messages = [{"role": "system", "content": SYSTEM}]
+    prev_id = None
 
     print("Fusion CAD Chatbot (Local)")
     print("Type 'exit' to quit.\n")
@@ -267,13 +372,16 @@ async def main():
     print("  Add 6 bolt holes on BCD 90 mm, hole dia 8 mm with countersink dia 14 mm at 82°.")
     print("  Create spur gear: teeth 24, module 2 mm, pressure angle 20°, thickness 10 mm, bore 10 mm.\n")
 
-    while True:
-        user_text = input("You: ").strip()
-        if user_text.lower() in {"exit", "quit"}:
-            break
+    try:
+        while True:
+            user_text = input("You: ").strip()
+            if user_text.lower() in {"exit", "quit"}:
+                break
 
-        reply, messages = await agent_turn(user_text, messages)
-        print("\nBot:", reply, "\n")
+            reply, messages, prev_id = await agent_turn(user_text, messages, prev_id)
+            print("\nBot:", reply, "\n")
+    finally:
+        await close_http()
 
 if __name__ == "__main__":
     asyncio.run(main())
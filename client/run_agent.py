@@ -1,42 +1,31 @@
-import os
-import json
-import httpx
-from dotenv import load_dotenv
-from openai import OpenAI
-
-# -----------------------
-# Load env
-# -----------------------
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-load_dotenv(os.path.join(ROOT, ".env"))
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-FUSION_URL = os.getenv("FUSION_BRIDGE_URL", "http://127.0.0.1:18080")
-FUSION_TOKEN = os.getenv("FUSION_BRIDGE_TOKEN", "")
+from __future__ import annotations
+
+from agent_common import (
+    FUSION_TOKEN,
+    OPENAI_API_KEY,
+    close_http,
+    dumps,
+    first_json_object,
+    get_http,
+    loads,
+    model_reply,
+)
 
 assert OPENAI_API_KEY, "Missing OPENAI_API_KEY in .env"
 assert FUSION_TOKEN, "Missing FUSION_BRIDGE_TOKEN in .env"
 
-client = OpenAI(api_key=OPENAI_API_KEY)
-
 # -----------------------
 # Fusion tool executor
 # -----------------------
 async def fusion_get(path: str) -> dict:
-    async with httpx.AsyncClient(timeout=30.0) as s:
-        r = await s.get(f"{FUSION_URL}{path}", headers={"X-Token": FUSION_TOKEN})
-        r.raise_for_status()
-        return r.json()
+    r = await get_http().get(path)
+    r.raise_for_status()
+    return r.json()
 
 async def fusion_tool(tool: str, args: dict) -> dict:
-    async with httpx.AsyncClient(timeout=30.0) as s:
-        r = await s.post(
-            f"{FUSION_URL}/tool",
-            headers={"X-Token": FUSION_TOKEN},
-            json={"tool": tool, "args": args or {}},
-        )
-        r.raise_for_status()
-        return r.json()
+    r = await get_http().post("/tool", json={"tool": tool, "args": args or {}})
+    r.raise_for_status()
+    return r.json()
 
 # Map of allowed tools (safety)
 ALLOWED_TOOLS = {
@@ -46,6 +35,7 @@ ALLOWED_TOOLS = {
     "fusion_extrude_last_profile": lambda args: fusion_tool("extrude_last_profile", args),
 }
 
+
 # -----------------------
 # Agent loop
 # -----------------------
@@ -75,7 +65,7 @@ GOAL = """Goal:
 def extract_json(text: str) -> dict:
     # Model should output pure JSON; this is a tiny guard.
     text = text.strip()
-    return json.loads(text)
+    return loads(first_json_object(text) or text)
 
 async def main(max_steps: int = 8):
     # Initial context given to the model
@@ -83,51 +73,52 @@ async def main(max_steps: int = 8):
         {"role": "system", "content": SYSTEM},
         {"role": "user", "content": GOAL},
     ]
-
-    for step in range(max_steps):
-        resp = client.responses.create(
-            model="gpt-4.1-mini",
-            input=messages,
-        )
-
-        model_text = (resp.output_text or "").strip()
-        try:
-            cmd = extract_json(model_text)
-        except Exception as e:
-            raise RuntimeError(f"Model did not return valid JSON.\nGot:\n{model_text}\n\nError: {e}")
-
-        if cmd.get("action") == "final":
-            print(cmd.get("message", ""))
-            return
-
-        if cmd.get("action") != "tool":
-            raise RuntimeError(f"Unknown action: {cmd}")
-
-        tool_name = cmd.get("tool_name")
-        args = cmd.get("args") or {}
-
-        if tool_name not in ALLOWED_TOOLS:
-            raise RuntimeError(f"Tool not allowed: {tool_name}")
-
-        # Execute locally
-        try:
-            result = await ALLOWED_TOOLS[tool_name](args)
-        except Exception as e:
-            result = {"ok": False, "error": str(e)}
-
-        # Feed result back to model
-        messages.append({"role": "assistant", "content": model_text})
-        messages.append(
-            {
-                "role": "user",
-                "content": json.dumps(
-                    {"tool_result": {"tool_name": tool_name, "args": args, "result": result}},
-                    indent=2,
-                ),
-            }
-        )
-
-    raise RuntimeError("Max steps reached without finishing.")
+    # Only the first call sends the full context; later calls chain on prev_id.
+    pending = messages
+    prev_id = None
+
+    try:
+        for step in range(max_steps):
+            model_text, prev_id = model_reply(pending, prev_id)
+            try:
+                cmd = extract_json(model_text)
+            except Exception as e:
+                raise RuntimeError(f"Model did not return valid JSON.\nGot:\n{model_text}\n\nError: {e}")
+
+            if cmd.get("action") == "final":
+                print(cmd.get("message", ""))
+                return
+
+            if cmd.get("action") != "tool":
+                raise RuntimeError(f"Unknown action: {cmd}")
+
+            tool_name = cmd.get("tool_name")
+            args = cmd.get("args") or {}
+
+            if tool_name not in ALLOWED_TOOLS:
+                raise RuntimeError(f"Tool not allowed: {tool_name}")
+
+            # Execute locally
+            try:
+                result = await ALLOWED_TOOLS[tool_name](args)
+            except Exception as e:
+                result = {"ok": False, "error": str(e)}
+
+            # Feed result back to model
+            messages.append({"role": "assistant", "content": model_text})
+            messages.append(
+                {
+                    "role": "user",
+                    "content": dumps(
+                        {"tool_result": {"tool_name": tool_name, "args": args, "result": result}}
+                    ),
+                }
+            )
+            pending = messages[-1:]
+
+        raise RuntimeError("Max steps reached without finishing.")
+    finally:
+        await close_http()
 
 if __name__ == "__main__":
     import asyncio
@@ -1,14 +1,30 @@
+import functools
 import json
 import math
+import socket
 import threading
+import time
 import traceback
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from queue import Queue
-from uuid import uuid4
+import types
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Full, Queue
+from urllib.parse import parse_qs, urlsplit
 
 import adsk.core
 import adsk.fusion
 
+try:
+    import orjson
+except ImportError:  # not bundled with Fusion's Python; stdlib json is the fallback
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # not bundled with Fusion's Python; gear math falls back to plain loops
+    np = None
+
 # ======================
 # Config
 # ======================
@@ -20,6 +36,33 @@ AUTH_TOKEN = "avez_fusion_2026_!9xQ3p"
 
 CUSTOM_EVENT_ID = "FusionBridgeExecEvent"
 
+# Fusion's internal length unit is always cm, so mm -> internal is a plain multiply
+# (no unitsManager.convert round-trip). Verified once per design in _ctx_or_none().
+_MM_TO_INTERNAL = 0.1
+
+# Seconds an HTTP thread waits for its task on the Fusion thread (keep below the client timeout).
+DEFAULT_TOOL_TIMEOUT = 30.0
+_TOOL_TIMEOUTS = {
+    "create_spur_gear_involute": 180.0,
+    "create_rack_gear": 120.0,
+    "circular_pattern_last_feature": 120.0,
+    "circular_pattern_last_body": 120.0,
+    "combine_all_bodies": 120.0,
+}
+
+# Max tasks waiting for the Fusion thread; beyond this requests get HTTP 503.
+TASK_QUEUE_SIZE = 64
+
+# Enum values / factories bound once (plain module attributes; safe at import time).
+_NEW_BODY = adsk.fusion.FeatureOperations.NewBodyFeatureOperation
+_JOIN = adsk.fusion.FeatureOperations.JoinFeatureOperation
+_CUT = adsk.fusion.FeatureOperations.CutFeatureOperation
+_INTERSECT = adsk.fusion.FeatureOperations.IntersectFeatureOperation
+_PLANE_SURF = adsk.core.SurfaceTypes.PlaneSurfaceType
+_PARAMETRIC = adsk.fusion.DesignTypes.ParametricDesignType
+_RIGID_JOINT = adsk.fusion.JointTypes.RigidJointType
+_POINT3D = adsk.core.Point3D.create
+
 # IMPORTANT: do NOT call adsk.core.Application.get() at import time
 app = None
 ui = None
@@ -27,18 +70,33 @@ ui = None
 _server = None
 _server_thread = None
 
-_task_queue = Queue()
-_task_results = {}
+# Items are (Future, fn, payload); the Fusion thread resolves each Future.
+_task_queue = Queue(maxsize=TASK_QUEUE_SIZE)
+# Set while a custom event is already queued on the UI thread; one fire drains every pending task.
+_event_pending = threading.Event()
+
+# Concurrent identical read-only calls share one Fusion-thread execution.
+READ_ONLY_TOOLS = {"ping", "get_state", "list_bodies", "get_last_body"}
+# Tools that never touch the Fusion API run directly on the HTTP thread.
+_INLINE_TOOLS = {"ping"}
+_inflight = {}
+_inflight_lock = threading.Lock()
 
 _custom_event = None
 _handlers = []
 
+# Sockets of live handler threads. Kept-alive connections outlive server.shutdown(),
+# so stop() shuts these down too; otherwise a reload leaves old handlers serving them.
+_open_conns = set()
+_open_conns_lock = threading.Lock()
+
 
 def _json_response(handler, code, obj):
-    data = json.dumps(obj).encode("utf-8")
+    data = orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
     handler.send_response(code)
     handler.send_header("Content-Type", "application/json")
     handler.send_header("Content-Length", str(len(data)))
+    handler.send_header("Connection", "close" if handler.close_connection else "keep-alive")
     handler.end_headers()
     handler.wfile.write(data)
 
@@ -49,20 +107,23 @@ def _auth_ok(handler):
 
 class _ExecEventHandler(adsk.core.CustomEventHandler):
     def notify(self, args: adsk.core.CustomEventArgs):
+        # Clear first: a task enqueued after this point either re-fires or is drained below.
+        _event_pending.clear()
         try:
             while not _task_queue.empty():
-                task_id, fn, payload = _task_queue.get_nowait()
+                fut, fn, payload = _task_queue.get_nowait()
+                # False if the HTTP thread already timed out and cancelled it.
+                if not fut.set_running_or_notify_cancel():
+                    continue
                 try:
                     out = fn(payload)
-                    _task_results[task_id]["result"] = {"ok": True, "result": out}
+                    fut.set_result({"ok": True, "result": out})
                 except Exception as e:
-                    _task_results[task_id]["result"] = {
+                    fut.set_result({
                         "ok": False,
                         "error": str(e),
                         "trace": traceback.format_exc(),
-                    }
-                finally:
-                    _task_results[task_id]["event"].set()
+                    })
         except Exception:
             try:
                 if ui:
@@ -71,22 +132,235 @@ class _ExecEventHandler(adsk.core.CustomEventHandler):
                 pass
 
 
-def _run_on_fusion_thread(fn, payload):
-    task_id = str(uuid4())
-    ev = threading.Event()
-    _task_results[task_id] = {"event": ev, "result": None}
+def _run_on_fusion_thread(fn, payload, timeout=DEFAULT_TOOL_TIMEOUT):
+    """Run fn(payload) on the Fusion UI thread. Raises queue.Full if the bridge is saturated."""
+    fut = Future()
+    _task_queue.put((fut, fn, payload), timeout=2.0)
+    if not _event_pending.is_set():
+        _event_pending.set()
+        app.fireCustomEvent(CUSTOM_EVENT_ID)
 
-    _task_queue.put((task_id, fn, payload))
-    app.fireCustomEvent(CUSTOM_EVENT_ID)
-
-    ev.wait(timeout=30.0)
-    res = _task_results[task_id]["result"]
-    del _task_results[task_id]
-    if res is None:
+    try:
+        return fut.result(timeout=timeout)
+    except FutureTimeoutError:
+        fut.cancel()
         return {"ok": False, "error": "Timeout waiting for Fusion execution."}
+
+
+def _run_coalesced(tool, fn, payload, timeout=DEFAULT_TOOL_TIMEOUT):
+    """Like _run_on_fusion_thread, but identical in-flight calls wait on the first one."""
+    if orjson is not None:
+        key = tool + "|" + orjson.dumps(payload, option=orjson.OPT_SORT_KEYS).decode()
+    else:
+        key = tool + "|" + json.dumps(payload, sort_keys=True)
+
+    with _inflight_lock:
+        shared = _inflight.get(key)
+        if shared is None:
+            _inflight[key] = fut = Future()
+    if shared is not None:
+        try:
+            return shared.result(timeout=timeout)
+        except FutureTimeoutError:
+            return {"ok": False, "error": "Timeout waiting for Fusion execution."}
+
+    try:
+        res = _run_on_fusion_thread(fn, payload, timeout)
+    except BaseException as e:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        fut.set_exception(e)
+        raise
+    # Unregister before publishing so later callers trigger a fresh read.
+    with _inflight_lock:
+        _inflight.pop(key, None)
+    fut.set_result(res)
     return res
 
 
+# ======================
+# Lookup tables
+# ======================
+
+_EXTRUDE_OP_MAP = {
+    "newBody": _NEW_BODY,
+    "join": _JOIN,
+    "cut": _CUT,
+    "intersect": _INTERSECT,
+}
+
+_COMBINE_OP_MAP = {
+    "join": _JOIN,
+    "cut": _CUT,
+    "intersect": _INTERSECT,
+}
+
+# Construction planes belong to each root component, so map to the attribute name.
+_PLANE_ATTR = {
+    "XY": "xYConstructionPlane",
+    "XZ": "xZConstructionPlane",
+    "YZ": "yZConstructionPlane",
+}
+
+
+# ======================
+# Design context
+# ======================
+
+# (product, design, root, unitsManager, internalUnits) for the last active product.
+_ctx_cache = None
+
+
+def _check_mm_to_internal(um, iu):
+    """Confirm the _MM_TO_INTERNAL shortcut against Fusion once per design.
+
+    Runs here rather than in start(): Fusion usually has no design open when the
+    add-in loads. Should the internal unit ever not be cm, adopt the real factor.
+    """
+    global _MM_TO_INTERNAL
+    factor = um.convert(1.0, "mm", iu)
+    if abs(factor - _MM_TO_INTERNAL) > 1e-12:
+        _MM_TO_INTERNAL = factor
+
+
+def _ctx_or_none():
+    """Return (design, root, unitsManager, internalUnits), or None without an active design.
+
+    Cached until the active product changes, so handlers skip re-resolving the same wrappers.
+    """
+    global _ctx_cache
+    product = app.activeProduct
+    c = _ctx_cache
+    if c is None or c[0] != product:
+        design = adsk.fusion.Design.cast(product)
+        if not design:
+            _ctx_cache = None
+            return None
+        um = design.unitsManager
+        iu = um.internalUnits
+        _check_mm_to_internal(um, iu)
+        c = _ctx_cache = (product, design, design.rootComponent, um, iu)
+    return c[1:]
+
+
+def _ctx():
+    ctx = _ctx_or_none()
+    if ctx is None:
+        raise Exception("No active Fusion design.")
+    return ctx
+
+
+# ======================
+# Shared API objects
+# ======================
+
+# Scratch collection for feature inputs. Everything runs on the single Fusion thread,
+# and each caller consumes it (createInput + add) before the next _objcoll() call.
+_scratch_coll = None
+
+
+def _objcoll(*items):
+    """Return the shared ObjectCollection, cleared and filled with items."""
+    global _scratch_coll
+    if _scratch_coll is None:
+        _scratch_coll = adsk.core.ObjectCollection.create()
+    else:
+        _scratch_coll.clear()
+    for it in items:
+        _scratch_coll.add(it)
+    return _scratch_coll
+
+
+# ValueInputs are immutable value holders that feature inputs copy from, so one
+# instance per distinct literal can be handed to any number of features.
+@functools.lru_cache(maxsize=64)
+def _vi_real(x):
+    return adsk.core.ValueInput.createByReal(x)
+
+
+@functools.lru_cache(maxsize=64)
+def _vi_str(expr):
+    return adsk.core.ValueInput.createByString(expr)
+
+
+# Identity transform for new occurrences; addNewComponent copies it into the occurrence.
+_identity_matrix = None
+
+
+def _identity():
+    global _identity_matrix
+    if _identity_matrix is None:
+        _identity_matrix = adsk.core.Matrix3D.create()
+    return _identity_matrix
+
+
+# (body.entityToken, body.revisionId) -> top planar face. revisionId changes whenever
+# the body is edited, so a hit is always the face of the current geometry and the cache
+# is never cleared on mutation (only bounded in size).
+_top_face_cache = {}
+
+
+def _find_top_planar_face(body):
+    """Planar face of body with the highest bbox-center Z."""
+    key = (body.entityToken, body.revisionId)
+    top_face = _top_face_cache.get(key)
+    if top_face is not None and top_face.isValid:
+        return top_face
+
+    top_face = None
+    top_z = -1e99
+    for f in body.faces:
+        geom = f.geometry
+        if geom is None or geom.surfaceType != _PLANE_SURF:
+            continue
+        bb = f.boundingBox
+        zc = 0.5 * (bb.minPoint.z + bb.maxPoint.z)
+        if zc > top_z:
+            top_z = zc
+            top_face = f
+
+    if not top_face:
+        raise Exception("No planar top face found.")
+
+    if len(_top_face_cache) >= 32:
+        _top_face_cache.clear()
+    _top_face_cache[key] = top_face
+    return top_face
+
+
+# get_state results keyed by (document, timeline length, marker position, last timeline
+# entity, fields). Bounded LRU; cleared after every mutating tool (see _run_mutating).
+# Edits made in the Fusion UI (parameter values, renames, visibility, suppression) don't
+# change the key, so entries also expire after a few seconds.
+_STATE_CACHE_SIZE = 8
+_STATE_CACHE_TTL = 2.0
+_state_cache = OrderedDict()
+
+
+def _state_cache_key(design, fields):
+    # Only parametric designs have a timeline that reflects every edit.
+    if design.designType != _PARAMETRIC:
+        return None
+    tl = design.timeline
+    n = tl.count
+    last = tl.item(n - 1).entity if n else None
+    return (
+        design.parentDocument.name,
+        n,
+        tl.markerPosition,
+        last.entityToken if last else None,
+        frozenset(fields),
+    )
+
+
+def _run_mutating(fn, payload):
+    """Run a geometry-changing handler, then drop cached reads it may have invalidated."""
+    try:
+        return fn(payload)
+    finally:
+        _state_cache.clear()
+
+
 # ======================
 # Tools
 # ======================
@@ -95,261 +369,243 @@ def _ping(_payload=None):
     return {"message": "pong"}
 
 
-def _get_state(_payload=None):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
+_STATE_FIELDS = ("designName", "defaultLengthUnits", "parameters", "bodies", "timeline")
+
+
+def _get_state(payload=None):
+    """Design summary. payload["fields"] limits which sections are collected (default: all)."""
+    ctx = _ctx_or_none()
+    if ctx is None:
         return {"design": None, "note": "No active Fusion design."}
 
-    root = design.rootComponent
+    design, root, units_mgr, _ = ctx
+    fields = (payload or {}).get("fields") or _STATE_FIELDS
+    if isinstance(fields, str):
+        fields = fields.split(",")  # same form as GET /state?fields=a,b
+    elif not isinstance(fields, (list, tuple)) or not all(isinstance(f, str) for f in fields):
+        raise Exception("fields must be a list of section names")
+    fields = {f.strip() for f in fields}
+    unknown = fields.difference(_STATE_FIELDS)
+    if unknown:
+        raise Exception(
+            f"Unknown fields: {', '.join(sorted(unknown))}. Valid: {', '.join(_STATE_FIELDS)}"
+        )
 
-    params = []
     try:
-        for p in design.allParameters:
-            params.append({
-                "name": p.name,
-                "expression": p.expression,
-                "value": p.value,
-                "unit": p.unit
-            })
+        key = _state_cache_key(design, fields)
     except Exception:
-        pass
+        key = None
+    if key is not None:
+        hit = _state_cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < _STATE_CACHE_TTL:
+            _state_cache.move_to_end(key)
+            return hit[1]
 
-    bodies = []
-    try:
-        for b in root.bRepBodies:
-            bodies.append({
-                "name": b.name,
-                "isSolid": b.isSolid,
-                "isVisible": b.isVisible
-            })
-    except Exception:
-        pass
+    out = {}
 
-    timeline = []
-    try:
-        tl = design.timeline
-        for i in range(tl.count):
-            tli = tl.item(i)
-            ent = tli.entity
-            timeline.append({
-                "index": i,
-                "name": tli.name,
-                "entityType": ent.entityType if ent else None
-            })
-    except Exception:
-        pass
+    if "designName" in fields:
+        out["designName"] = design.parentDocument.name
 
-    units_mgr = design.unitsManager
-    default_len_units = units_mgr.defaultLengthUnits if units_mgr else None
+    if "defaultLengthUnits" in fields:
+        out["defaultLengthUnits"] = units_mgr.defaultLengthUnits if units_mgr else None
 
-    return {
-        "designName": design.parentDocument.name,
-        "defaultLengthUnits": default_len_units,
-        "parameters": params,
-        "bodies": bodies,
-        "timeline": timeline
-    }
+    if "parameters" in fields:
+        params = []
+        try:
+            params = [
+                {"name": p.name, "expression": p.expression, "value": p.value, "unit": p.unit}
+                for p in design.allParameters
+            ]
+        except Exception:
+            pass
+        out["parameters"] = params
 
+    if "bodies" in fields:
+        bodies = []
+        try:
+            bodies = [
+                {"name": b.name, "isSolid": b.isSolid, "isVisible": b.isVisible}
+                for b in root.bRepBodies
+            ]
+        except Exception:
+            pass
+        out["bodies"] = bodies
 
-def _list_bodies(_payload=None):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
+    if "timeline" in fields:
+        timeline = []
+        try:
+            tl = design.timeline
+            tl_item = tl.item
+            n = tl.count
+            timeline = [None] * n
+            for i in range(n):
+                tli = tl_item(i)
+                ent = tli.entity
+                timeline[i] = {
+                    "index": i,
+                    "name": tli.name,
+                    "entityType": ent.entityType if ent else None
+                }
+        except Exception:
+            pass
+        out["timeline"] = timeline
+
+    if key is not None:
+        _state_cache[key] = (time.monotonic(), out)
+        _state_cache.move_to_end(key)
+        if len(_state_cache) > _STATE_CACHE_SIZE:
+            _state_cache.popitem(last=False)
+    return out
 
-    out = []
-    for i in range(root.bRepBodies.count):
-        b = root.bRepBodies.item(i)
-        bb = b.boundingBox
-        out.append({
+
+def _list_bodies(payload=None):
+    """Bodies in the root component. Bounding boxes only when payload["include_bbox"] is set."""
+    design, root, um, iu = _ctx()
+
+    include_bbox = bool((payload or {}).get("include_bbox", False))
+
+    brep = root.bRepBodies
+    item = brep.item
+    n = brep.count
+    out = [None] * n
+    for i in range(n):
+        b = item(i)
+        entry = {
             "index": i,
             "name": b.name,
             "isSolid": b.isSolid,
             "isVisible": b.isVisible,
-            "bbox": {
-                "min": [bb.minPoint.x, bb.minPoint.y, bb.minPoint.z],
-                "max": [bb.maxPoint.x, bb.maxPoint.y, bb.maxPoint.z],
+        }
+        if include_bbox:
+            bb = b.boundingBox
+            minp = bb.minPoint
+            maxp = bb.maxPoint
+            entry["bbox"] = {
+                "min": [minp.x, minp.y, minp.z],
+                "max": [maxp.x, maxp.y, maxp.z],
             }
-        })
+        out[i] = entry
     return {"bodies": out}
 
 
 def _get_last_body(_payload=None):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    if root.bRepBodies.count < 1:
+    design, root, um, iu = _ctx()
+    brep = root.bRepBodies
+    n = brep.count
+    if n < 1:
         raise Exception("No bodies found.")
-    b = root.bRepBodies.item(root.bRepBodies.count - 1)
-    return {"bodyIndex": root.bRepBodies.count - 1, "bodyName": b.name}
+    b = brep.item(n - 1)
+    return {"bodyIndex": n - 1, "bodyName": b.name}
 
 
 def _create_sketch_on_plane(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-
-    plane = str(payload.get("plane", "XY")).upper()
-    if plane == "XY":
-        cp = root.xYConstructionPlane
-    elif plane == "XZ":
-        cp = root.xZConstructionPlane
-    elif plane == "YZ":
-        cp = root.yZConstructionPlane
-    else:
-        raise Exception("plane must be XY, XZ, or YZ")
+    design, root, um, iu = _ctx()
 
-    sk = root.sketches.add(cp)
+    sk = _sketch_on_plane(root, payload)
     return {"sketchName": sk.name}
 
 
 def _create_sketch_rect_xy(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
+    design, root, um, iu = _ctx()
 
     x_mm = float(payload.get("x_mm", 40.0))
     y_mm = float(payload.get("y_mm", 30.0))
 
-    um = design.unitsManager
-    x = um.convert(x_mm, "mm", um.internalUnits)
-    y = um.convert(y_mm, "mm", um.internalUnits)
+    x = x_mm * _MM_TO_INTERNAL
+    y = y_mm * _MM_TO_INTERNAL
 
     sk = root.sketches.add(root.xYConstructionPlane)
     lines = sk.sketchCurves.sketchLines
 
-    p0 = adsk.core.Point3D.create(0, 0, 0)
-    p1 = adsk.core.Point3D.create(x, 0, 0)
-    p2 = adsk.core.Point3D.create(x, y, 0)
-    p3 = adsk.core.Point3D.create(0, y, 0)
-
-    lines.addByTwoPoints(p0, p1)
-    lines.addByTwoPoints(p1, p2)
-    lines.addByTwoPoints(p2, p3)
-    lines.addByTwoPoints(p3, p0)
+    # One call builds all four edges with shared corners (opposite corners given).
+    lines.addTwoPointRectangle(_POINT3D(0, 0, 0), _POINT3D(x, y, 0))
 
     return {"sketchName": sk.name, "profilesCount": sk.profiles.count}
 
 
 def _create_sketch_circle_xy(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    um = design.unitsManager
+    design, root, um, iu = _ctx()
 
     r_mm = float(payload.get("r_mm", 10.0))
     cx_mm = float(payload.get("cx_mm", 0.0))
     cy_mm = float(payload.get("cy_mm", 0.0))
 
-    r = um.convert(r_mm, "mm", um.internalUnits)
-    cx = um.convert(cx_mm, "mm", um.internalUnits)
-    cy = um.convert(cy_mm, "mm", um.internalUnits)
+    r = r_mm * _MM_TO_INTERNAL
+    cx = cx_mm * _MM_TO_INTERNAL
+    cy = cy_mm * _MM_TO_INTERNAL
 
     sk = root.sketches.add(root.xYConstructionPlane)
     circles = sk.sketchCurves.sketchCircles
-    circles.addByCenterRadius(adsk.core.Point3D.create(cx, cy, 0), r)
+    circles.addByCenterRadius(_POINT3D(cx, cy, 0), r)
 
     return {"sketchName": sk.name, "profilesCount": sk.profiles.count}
 
 
 def _create_sketch_two_circles_xy(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    um = design.unitsManager
+    design, root, um, iu = _ctx()
 
     od_mm = float(payload.get("od_mm"))
     id_mm = float(payload.get("id_mm", 0.0))
 
-    od_r = um.convert(od_mm / 2.0, "mm", um.internalUnits)
-    id_r = um.convert(id_mm / 2.0, "mm", um.internalUnits) if id_mm > 0 else 0
+    od_r = (od_mm / 2.0) * _MM_TO_INTERNAL
+    id_r = (id_mm / 2.0) * _MM_TO_INTERNAL if id_mm > 0 else 0
 
     sk = root.sketches.add(root.xYConstructionPlane)
     circles = sk.sketchCurves.sketchCircles
-    circles.addByCenterRadius(adsk.core.Point3D.create(0, 0, 0), od_r)
-    if id_mm > 0:
-        circles.addByCenterRadius(adsk.core.Point3D.create(0, 0, 0), id_r)
+    sk.isComputeDeferred = True
+    try:
+        circles.addByCenterRadius(_POINT3D(0, 0, 0), od_r)
+        if id_mm > 0:
+            circles.addByCenterRadius(_POINT3D(0, 0, 0), id_r)
+    finally:
+        sk.isComputeDeferred = False
 
     return {"sketchName": sk.name, "profilesCount": sk.profiles.count}
 
 
 def _create_sketch_on_last_body_top(_payload=None):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    if root.bRepBodies.count < 1:
+    design, root, um, iu = _ctx()
+    brep = root.bRepBodies
+    n = brep.count
+    if n < 1:
         raise Exception("No bodies found.")
 
-    body = root.bRepBodies.item(root.bRepBodies.count - 1)
+    body = brep.item(n - 1)
 
-    # find top planar face by max Z centroid (bbox)
-    top_face = None
-    top_z = -1e99
-    for f in body.faces:
-        try:
-            if f.geometry.surfaceType != adsk.core.SurfaceTypes.PlaneSurfaceType:
-                continue
-            bb = f.boundingBox
-            zc = 0.5 * (bb.minPoint.z + bb.maxPoint.z)
-            if zc > top_z:
-                top_z = zc
-                top_face = f
-        except Exception:
-            pass
-
-    if not top_face:
-        raise Exception("No planar top face found.")
+    top_face = _find_top_planar_face(body)
 
     sk = root.sketches.add(top_face)
     return {"sketchName": sk.name}
 
 
 def _sketch_center_rectangle(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    um = design.unitsManager
+    design, root, um, iu = _ctx()
 
     w_mm = float(payload.get("w_mm", 40))
     h_mm = float(payload.get("h_mm", 30))
     cx_mm = float(payload.get("cx_mm", 0))
     cy_mm = float(payload.get("cy_mm", 0))
 
-    w = um.convert(w_mm, "mm", um.internalUnits)
-    h = um.convert(h_mm, "mm", um.internalUnits)
-    cx = um.convert(cx_mm, "mm", um.internalUnits)
-    cy = um.convert(cy_mm, "mm", um.internalUnits)
+    w = w_mm * _MM_TO_INTERNAL
+    h = h_mm * _MM_TO_INTERNAL
+    cx = cx_mm * _MM_TO_INTERNAL
+    cy = cy_mm * _MM_TO_INTERNAL
 
     if root.sketches.count < 1:
         raise Exception("No sketch available. Create a sketch first.")
     sk = root.sketches.item(root.sketches.count - 1)
 
     lines = sk.sketchCurves.sketchLines
-    p0 = adsk.core.Point3D.create(cx - w / 2, cy - h / 2, 0)
-    p1 = adsk.core.Point3D.create(cx + w / 2, cy - h / 2, 0)
-    p2 = adsk.core.Point3D.create(cx + w / 2, cy + h / 2, 0)
-    p3 = adsk.core.Point3D.create(cx - w / 2, cy + h / 2, 0)
-    lines.addByTwoPoints(p0, p1)
-    lines.addByTwoPoints(p1, p2)
-    lines.addByTwoPoints(p2, p3)
-    lines.addByTwoPoints(p3, p0)
+    lines.addCenterPointRectangle(
+        _POINT3D(cx, cy, 0),
+        _POINT3D(cx + w / 2, cy + h / 2, 0),
+    )
 
     return {"profilesCount": sk.profiles.count}
 
 
 def _sketch_two_circles_current(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    um = design.unitsManager
+    design, root, um, iu = _ctx()
     if root.sketches.count < 1:
         raise Exception("No sketch available.")
     sk = root.sketches.item(root.sketches.count - 1)
@@ -358,44 +614,41 @@ def _sketch_two_circles_current(payload):
     od_mm = float(payload.get("od_mm"))
     id_mm = float(payload.get("id_mm", 0.0))
 
-    od_r = um.convert(od_mm / 2.0, "mm", um.internalUnits)
-    circles.addByCenterRadius(adsk.core.Point3D.create(0, 0, 0), od_r)
+    od_r = (od_mm / 2.0) * _MM_TO_INTERNAL
+    sk.isComputeDeferred = True
+    try:
+        circles.addByCenterRadius(_POINT3D(0, 0, 0), od_r)
 
-    if id_mm and id_mm > 0:
-        id_r = um.convert(id_mm / 2.0, "mm", um.internalUnits)
-        circles.addByCenterRadius(adsk.core.Point3D.create(0, 0, 0), id_r)
+        if id_mm and id_mm > 0:
+            id_r = (id_mm / 2.0) * _MM_TO_INTERNAL
+            circles.addByCenterRadius(_POINT3D(0, 0, 0), id_r)
+    finally:
+        sk.isComputeDeferred = False
 
     return {"profilesCount": sk.profiles.count}
 
 
 def _sketch_line(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    um = design.unitsManager
+    design, root, um, iu = _ctx()
 
-    x1 = um.convert(float(payload.get("x1_mm", 0)), "mm", um.internalUnits)
-    y1 = um.convert(float(payload.get("y1_mm", 0)), "mm", um.internalUnits)
-    x2 = um.convert(float(payload.get("x2_mm", 10)), "mm", um.internalUnits)
-    y2 = um.convert(float(payload.get("y2_mm", 0)), "mm", um.internalUnits)
+    x1 = float(payload.get("x1_mm", 0)) * _MM_TO_INTERNAL
+    y1 = float(payload.get("y1_mm", 0)) * _MM_TO_INTERNAL
+    x2 = float(payload.get("x2_mm", 10)) * _MM_TO_INTERNAL
+    y2 = float(payload.get("y2_mm", 0)) * _MM_TO_INTERNAL
 
     if root.sketches.count < 1:
         raise Exception("No sketch available.")
     sk = root.sketches.item(root.sketches.count - 1)
 
     sk.sketchCurves.sketchLines.addByTwoPoints(
-        adsk.core.Point3D.create(x1, y1, 0),
-        adsk.core.Point3D.create(x2, y2, 0),
+        _POINT3D(x1, y1, 0),
+        _POINT3D(x2, y2, 0),
     )
     return {"profilesCount": sk.profiles.count}
 
 
 def _extrude_last_profile(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
+    design, root, um, iu = _ctx()
 
     distance_mm = float(payload.get("distance_mm", 5.0))
     operation = payload.get("operation", "newBody")
@@ -408,31 +661,20 @@ def _extrude_last_profile(payload):
         raise Exception("Sketch has no profiles to extrude.")
     prof = sk.profiles.item(0)
 
-    um = design.unitsManager
-    dist = um.convert(distance_mm, "mm", um.internalUnits)
+    dist = distance_mm * _MM_TO_INTERNAL
 
     extrudes = root.features.extrudeFeatures
-    ext_input = extrudes.createInput(prof, adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
+    ext_input = extrudes.createInput(prof, _NEW_BODY)
 
-    opmap = {
-        "newBody": adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
-        "join": adsk.fusion.FeatureOperations.JoinFeatureOperation,
-        "cut": adsk.fusion.FeatureOperations.CutFeatureOperation,
-        "intersect": adsk.fusion.FeatureOperations.IntersectFeatureOperation,
-    }
-    ext_input.operation = opmap.get(operation, opmap["newBody"])
-    ext_input.setDistanceExtent(False, adsk.core.ValueInput.createByReal(dist))
+    ext_input.operation = _EXTRUDE_OP_MAP.get(operation, _EXTRUDE_OP_MAP["newBody"])
+    ext_input.setDistanceExtent(False, _vi_real(dist))
 
     ext = extrudes.add(ext_input)
     return {"extrudeFeatureName": ext.name, "bodiesCount": root.bRepBodies.count}
 
 
 def _extrude_profile(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    um = design.unitsManager
+    design, root, um, iu = _ctx()
 
     sketch_index_from_end = int(payload.get("sketch_index_from_end", 1))
     profile_index = int(payload.get("profile_index", 0))
@@ -448,29 +690,111 @@ def _extrude_profile(payload):
         raise Exception("Invalid profile_index.")
     prof = sk.profiles.item(profile_index)
 
-    dist = um.convert(distance_mm, "mm", um.internalUnits)
+    dist = distance_mm * _MM_TO_INTERNAL
 
     extrudes = root.features.extrudeFeatures
-    ext_input = extrudes.createInput(prof, adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
+    ext_input = extrudes.createInput(prof, _NEW_BODY)
 
-    opmap = {
-        "newBody": adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
-        "join": adsk.fusion.FeatureOperations.JoinFeatureOperation,
-        "cut": adsk.fusion.FeatureOperations.CutFeatureOperation,
-        "intersect": adsk.fusion.FeatureOperations.IntersectFeatureOperation,
-    }
-    ext_input.operation = opmap.get(operation, opmap["newBody"])
-    ext_input.setDistanceExtent(False, adsk.core.ValueInput.createByReal(dist))
+    ext_input.operation = _EXTRUDE_OP_MAP.get(operation, _EXTRUDE_OP_MAP["newBody"])
+    ext_input.setDistanceExtent(False, _vi_real(dist))
 
     ext = extrudes.add(ext_input)
     return {"extrudeFeatureName": ext.name, "bodiesCount": root.bRepBodies.count}
 
 
+# ======================
+# NEW: fused primitives (sketch + extrude in one call)
+# ======================
+
+def _sketch_on_plane(root, payload):
+    plane = str(payload.get("plane", "XY")).upper()
+    attr = _PLANE_ATTR.get(plane)
+    if attr is None:
+        raise Exception("plane must be XY, XZ, or YZ")
+    return root.sketches.add(getattr(root, attr))
+
+
+def _extrude_new_body(root, prof, dist):
+    extrudes = root.features.extrudeFeatures
+    ext_in = extrudes.createInput(prof, _NEW_BODY)
+    ext_in.setDistanceExtent(False, _vi_real(dist))
+    return extrudes.add(ext_in)
+
+
+def _box(payload):
+    """Rectangle from the origin + new-body extrude."""
+    design, root, um, iu = _ctx()
+
+    x = float(payload.get("x_mm", 40.0)) * _MM_TO_INTERNAL
+    y = float(payload.get("y_mm", 30.0)) * _MM_TO_INTERNAL
+    z = float(payload.get("z_mm", 10.0)) * _MM_TO_INTERNAL
+
+    sk = _sketch_on_plane(root, payload)
+    sk.sketchCurves.sketchLines.addTwoPointRectangle(
+        _POINT3D(0, 0, 0), _POINT3D(x, y, 0)
+    )
+    if sk.profiles.count < 1:
+        raise Exception("No rectangle profile created.")
+
+    ext = _extrude_new_body(root, sk.profiles.item(0), z)
+    return {"sketchName": sk.name, "extrudeFeatureName": ext.name, "bodiesCount": root.bRepBodies.count}
+
+
+def _cylinder(payload):
+    """Circle + new-body extrude."""
+    design, root, um, iu = _ctx()
+
+    r = float(payload.get("r_mm", 10.0)) * _MM_TO_INTERNAL
+    h = float(payload.get("height_mm", 10.0)) * _MM_TO_INTERNAL
+    cx = float(payload.get("cx_mm", 0.0)) * _MM_TO_INTERNAL
+    cy = float(payload.get("cy_mm", 0.0)) * _MM_TO_INTERNAL
+
+    sk = _sketch_on_plane(root, payload)
+    sk.sketchCurves.sketchCircles.addByCenterRadius(_POINT3D(cx, cy, 0), r)
+    if sk.profiles.count < 1:
+        raise Exception("No circle profile created.")
+
+    ext = _extrude_new_body(root, sk.profiles.item(0), h)
+    return {"sketchName": sk.name, "extrudeFeatureName": ext.name, "bodiesCount": root.bRepBodies.count}
+
+
+def _tube(payload):
+    """Two concentric circles + new-body extrude of the ring between them."""
+    design, root, um, iu = _ctx()
+
+    od_mm = float(payload.get("od_mm"))
+    id_mm = float(payload.get("id_mm"))
+    if not 0 < id_mm < od_mm:
+        raise Exception("id_mm must be > 0 and < od_mm")
+
+    h = float(payload.get("height_mm", 10.0)) * _MM_TO_INTERNAL
+
+    sk = _sketch_on_plane(root, payload)
+    circles = sk.sketchCurves.sketchCircles
+    center = _POINT3D(0, 0, 0)
+    sk.isComputeDeferred = True
+    try:
+        circles.addByCenterRadius(center, (od_mm / 2.0) * _MM_TO_INTERNAL)
+        circles.addByCenterRadius(center, (id_mm / 2.0) * _MM_TO_INTERNAL)
+    finally:
+        sk.isComputeDeferred = False
+
+    # The ring is the profile with two loops (outer + hole); the other one is the inner disc.
+    ring = None
+    for i in range(sk.profiles.count):
+        prof = sk.profiles.item(i)
+        if prof.profileLoops.count == 2:
+            ring = prof
+            break
+    if ring is None:
+        raise Exception("No ring profile created.")
+
+    ext = _extrude_new_body(root, ring, h)
+    return {"sketchName": sk.name, "extrudeFeatureName": ext.name, "bodiesCount": root.bRepBodies.count}
+
+
 def _revolve_profile(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
+    design, root, um, iu = _ctx()
 
     sketch_index_from_end = int(payload.get("sketch_index_from_end", 1))
     profile_index = int(payload.get("profile_index", 0))
@@ -491,20 +815,18 @@ def _revolve_profile(payload):
     axis_line = sk.sketchCurves.sketchLines.item(axis_line_index)
 
     revol = root.features.revolveFeatures
-    rev_in = revol.createInput(prof, axis_line, adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
-    rev_in.setAngleExtent(False, adsk.core.ValueInput.createByString(f"{angle_deg} deg"))
+    rev_in = revol.createInput(prof, axis_line, _NEW_BODY)
+    rev_in.setAngleExtent(False, _vi_str(f"{angle_deg} deg"))
     feat = revol.add(rev_in)
     return {"revolveFeatureName": feat.name, "bodiesCount": root.bRepBodies.count}
 
 
 def _hole_on_last_body_top_face(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    um = design.unitsManager
+    design, root, um, iu = _ctx()
 
-    if root.bRepBodies.count < 1:
+    brep = root.bRepBodies
+    n = brep.count
+    if n < 1:
         raise Exception("No bodies found.")
 
     dia_mm = float(payload.get("dia_mm", 5.0))
@@ -512,37 +834,22 @@ def _hole_on_last_body_top_face(payload):
     x_mm = float(payload.get("x_mm", 0.0))
     y_mm = float(payload.get("y_mm", 0.0))
 
-    dia = um.convert(dia_mm, "mm", um.internalUnits)
-    depth = um.convert(depth_mm, "mm", um.internalUnits)
-    x = um.convert(x_mm, "mm", um.internalUnits)
-    y = um.convert(y_mm, "mm", um.internalUnits)
-
-    body = root.bRepBodies.item(root.bRepBodies.count - 1)
+    dia = dia_mm * _MM_TO_INTERNAL
+    depth = depth_mm * _MM_TO_INTERNAL
+    x = x_mm * _MM_TO_INTERNAL
+    y = y_mm * _MM_TO_INTERNAL
 
-    top_face = None
-    top_z = -1e99
-    for f in body.faces:
-        try:
-            if f.geometry.surfaceType != adsk.core.SurfaceTypes.PlaneSurfaceType:
-                continue
-            bb = f.boundingBox
-            zc = 0.5 * (bb.minPoint.z + bb.maxPoint.z)
-            if zc > top_z:
-                top_z = zc
-                top_face = f
-        except Exception:
-            pass
+    body = brep.item(n - 1)
 
-    if not top_face:
-        raise Exception("No planar top face found.")
+    top_face = _find_top_planar_face(body)
 
     sk = root.sketches.add(top_face)
-    pt = sk.sketchPoints.add(adsk.core.Point3D.create(x, y, 0))
+    pt = sk.sketchPoints.add(_POINT3D(x, y, 0))
 
     holes = root.features.holeFeatures
-    hole_input = holes.createSimpleInput(adsk.core.ValueInput.createByReal(dia))
+    hole_input = holes.createSimpleInput(_vi_real(dia))
     hole_input.setPositionBySketchPoint(pt)
-    hole_input.setDistanceExtent(adsk.core.ValueInput.createByReal(depth))
+    hole_input.setDistanceExtent(_vi_real(depth))
     hole = holes.add(hole_input)
 
     return {"holeFeatureName": hole.name}
@@ -566,11 +873,51 @@ def _hole_bolt_circle_one(payload):
     })
 
 
+def _hole_bolt_circle(payload):
+    """All bolt-circle holes at once: one sketch with qty points, one hole feature."""
+    design, root, um, iu = _ctx()
+
+    brep = root.bRepBodies
+    n = brep.count
+    if n < 1:
+        raise Exception("No bodies found.")
+
+    qty = int(payload.get("qty", 6))
+    bcd_mm = float(payload.get("bcd_mm"))
+    hole_dia_mm = float(payload.get("hole_dia_mm"))
+    depth_mm = float(payload.get("depth_mm", 9999.0))
+    start_angle_deg = float(payload.get("start_angle_deg", 0.0))
+    if qty < 1:
+        raise Exception("qty must be >= 1")
+
+    r = (bcd_mm / 2.0) * _MM_TO_INTERNAL
+    dia = hole_dia_mm * _MM_TO_INTERNAL
+    depth = depth_mm * _MM_TO_INTERNAL
+
+    top_face = _find_top_planar_face(brep.item(n - 1))
+    sk = root.sketches.add(top_face)
+
+    sk_points = sk.sketchPoints
+    pts = []
+    sk.isComputeDeferred = True
+    try:
+        for i in range(qty):
+            ang = math.radians(start_angle_deg + i * 360.0 / qty)
+            pts.append(sk_points.add(_POINT3D(r * math.cos(ang), r * math.sin(ang), 0)))
+    finally:
+        sk.isComputeDeferred = False
+
+    holes = root.features.holeFeatures
+    hole_input = holes.createSimpleInput(_vi_real(dia))
+    hole_input.setPositionBySketchPoints(_objcoll(*pts))
+    hole_input.setDistanceExtent(_vi_real(depth))
+    hole = holes.add(hole_input)
+
+    return {"holeFeatureName": hole.name, "holesCount": qty}
+
+
 def _circular_pattern_last_feature(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
+    design, root, um, iu = _ctx()
 
     qty = int(payload.get("qty", 6))
     angle = str(payload.get("angle", "360 deg"))
@@ -582,28 +929,25 @@ def _circular_pattern_last_feature(payload):
     if not ent:
         raise Exception("Last timeline entity not found.")
 
-    objs = adsk.core.ObjectCollection.create()
-    objs.add(ent)
+    objs = _objcoll(ent)
 
     axis = root.zConstructionAxis
 
     pats = root.features.circularPatternFeatures
     pat_in = pats.createInput(objs, axis)
-    pat_in.quantity = adsk.core.ValueInput.createByReal(qty)
-    pat_in.totalAngle = adsk.core.ValueInput.createByString(angle)
+    pat_in.quantity = _vi_real(qty)
+    pat_in.totalAngle = _vi_str(angle)
     pat = pats.add(pat_in)
 
     return {"patternFeatureName": pat.name}
 
 
 def _countersink_hole_on_last_body_top_face(payload):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    um = design.unitsManager
+    design, root, um, iu = _ctx()
 
-    if root.bRepBodies.count < 1:
+    brep = root.bRepBodies
+    n = brep.count
+    if n < 1:
         raise Exception("No bodies found.")
 
     hole_dia_mm = float(payload.get("hole_dia_mm", 6.0))
@@ -613,41 +957,28 @@ def _countersink_hole_on_last_body_top_face(payload):
     x_mm = float(payload.get("x_mm", 0.0))
     y_mm = float(payload.get("y_mm", 0.0))
 
-    hole_d = um.convert(hole_dia_mm, "mm", um.internalUnits)
-    cs_d = um.convert(cs_dia_mm, "mm", um.internalUnits)
-    depth = um.convert(depth_mm, "mm", um.internalUnits)
-    x = um.convert(x_mm, "mm", um.internalUnits)
-    y = um.convert(y_mm, "mm", um.internalUnits)
+    hole_d = hole_dia_mm * _MM_TO_INTERNAL
+    cs_d = cs_dia_mm * _MM_TO_INTERNAL
+    depth = depth_mm * _MM_TO_INTERNAL
+    x = x_mm * _MM_TO_INTERNAL
+    y = y_mm * _MM_TO_INTERNAL
 
-    body = root.bRepBodies.item(root.bRepBodies.count - 1)
+    body = brep.item(n - 1)
 
-    top_face = None
-    top_z = -1e99
-    for f in body.faces:
-        try:
-            if f.geometry.surfaceType != adsk.core.SurfaceTypes.PlaneSurfaceType:
-                continue
-            bb = f.boundingBox
-            zc = 0.5 * (bb.minPoint.z + bb.maxPoint.z)
-            if zc > top_z:
-                top_z, top_face = zc, f
-        except Exception:
-            pass
-    if not top_face:
-        raise Exception("No planar top face found.")
+    top_face = _find_top_planar_face(body)
 
     sk = root.sketches.add(top_face)
-    pt = sk.sketchPoints.add(adsk.core.Point3D.create(x, y, 0))
+    pt = sk.sketchPoints.add(_POINT3D(x, y, 0))
 
     holes = root.features.holeFeatures
-    hole_input = holes.createSimpleInput(adsk.core.ValueInput.createByReal(hole_d))
+    hole_input = holes.createSimpleInput(_vi_real(hole_d))
     hole_input.setPositionBySketchPoint(pt)
-    hole_input.setDistanceExtent(adsk.core.ValueInput.createByReal(depth))
+    hole_input.setDistanceExtent(_vi_real(depth))
 
     # Countersink
-    hole_input.tipAngle = adsk.core.ValueInput.createByString(f"{cs_angle_deg} deg")
+    hole_input.tipAngle = _vi_str(f"{cs_angle_deg} deg")
     hole_input.isCountersink = True
-    hole_input.countersinkDiameter = adsk.core.ValueInput.createByReal(cs_d)
+    hole_input.countersinkDiameter = _vi_real(cs_d)
 
     hole_feat = holes.add(hole_input)
     return {"holeFeatureName": hole_feat.name}
@@ -657,13 +988,12 @@ def _countersink_hole_on_last_body_top_face(payload):
 # ======================
 
 def _delete_all_bodies(_payload=None):
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
+    design, root, um, iu = _ctx()
 
     # Copy list first, then delete
-    bodies = [root.bRepBodies.item(i) for i in range(root.bRepBodies.count)]
+    brep = root.bRepBodies
+    item = brep.item
+    bodies = [item(i) for i in range(brep.count)]
     deleted = 0
     for b in bodies:
         try:
@@ -671,68 +1001,56 @@ def _delete_all_bodies(_payload=None):
             deleted += 1
         except:
             pass
-    return {"deletedBodies": deleted, "remainingBodies": root.bRepBodies.count}
+    return {"deletedBodies": deleted, "remainingBodies": brep.count}
 
 
 def _combine_all_bodies(payload):
     """Join all bodies into one (target = first body)."""
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
+    design, root, um, iu = _ctx()
 
-    if root.bRepBodies.count < 2:
-        return {"note": "Need >=2 bodies to combine.", "bodiesCount": root.bRepBodies.count}
+    brep = root.bRepBodies
+    n = brep.count
+    if n < 2:
+        return {"note": "Need >=2 bodies to combine.", "bodiesCount": n}
 
     op = str(payload.get("operation", "join")).lower()  # join|cut|intersect
-    target = root.bRepBodies.item(0)
+    item = brep.item
+    target = item(0)
 
-    tools = adsk.core.ObjectCollection.create()
-    for i in range(1, root.bRepBodies.count):
-        tools.add(root.bRepBodies.item(i))
+    tools = _objcoll(*[item(i) for i in range(1, n)])
 
     cmb = root.features.combineFeatures
     cmb_in = cmb.createInput(target, tools)
-
-    if op == "cut":
-        cmb_in.operation = adsk.fusion.FeatureOperations.CutFeatureOperation
-        cmb_in.isKeepToolBodies = False
-    elif op == "intersect":
-        cmb_in.operation = adsk.fusion.FeatureOperations.IntersectFeatureOperation
-        cmb_in.isKeepToolBodies = False
-    else:
-        cmb_in.operation = adsk.fusion.FeatureOperations.JoinFeatureOperation
-        cmb_in.isKeepToolBodies = False
+    cmb_in.operation = _COMBINE_OP_MAP.get(op, _COMBINE_OP_MAP["join"])
+    cmb_in.isKeepToolBodies = False
 
     feat = cmb.add(cmb_in)
-    return {"combineFeatureName": feat.name, "bodiesCount": root.bRepBodies.count}
+    return {"combineFeatureName": feat.name, "bodiesCount": brep.count}
 
 
 def _circular_pattern_last_body(payload):
     """Pattern the LAST body around Z axis (not last feature)."""
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
+    design, root, um, iu = _ctx()
 
     qty = int(payload.get("qty", 6))
     total_angle = str(payload.get("angle", "360 deg"))
 
-    if root.bRepBodies.count < 1:
+    brep = root.bRepBodies
+    n = brep.count
+    if n < 1:
         raise Exception("No bodies found to pattern.")
 
-    body = root.bRepBodies.item(root.bRepBodies.count - 1)
+    body = brep.item(n - 1)
 
-    objs = adsk.core.ObjectCollection.create()
-    objs.add(body)
+    objs = _objcoll(body)
 
     pats = root.features.circularPatternFeatures
     pat_in = pats.createInput(objs, root.zConstructionAxis)
-    pat_in.quantity = adsk.core.ValueInput.createByReal(qty)
-    pat_in.totalAngle = adsk.core.ValueInput.createByString(total_angle)
+    pat_in.quantity = _vi_real(qty)
+    pat_in.totalAngle = _vi_str(total_angle)
     pat = pats.add(pat_in)
 
-    return {"patternFeatureName": pat.name, "bodiesCount": root.bRepBodies.count}
+    return {"patternFeatureName": pat.name, "bodiesCount": brep.count}
 
 
 # ======================
@@ -741,18 +1059,17 @@ def _circular_pattern_last_body(payload):
 
 def _component_from_last_body(payload):
     """Create a new component and move the last body into it."""
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
+    design, root, um, iu = _ctx()
 
     name = str(payload.get("name", "Comp"))
-    if root.bRepBodies.count < 1:
+    brep = root.bRepBodies
+    n = brep.count
+    if n < 1:
         raise Exception("No bodies to move into component.")
 
-    body = root.bRepBodies.item(root.bRepBodies.count - 1)
+    body = brep.item(n - 1)
 
-    occ = root.occurrences.addNewComponent(adsk.core.Matrix3D.create())
+    occ = root.occurrences.addNewComponent(_identity())
     comp = occ.component
     comp.name = name
 
@@ -762,10 +1079,7 @@ def _component_from_last_body(payload):
 
 def _rigid_joint_last_two_components(_payload=None):
     """Create an As-Built rigid joint between last two occurrences in root."""
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
+    design, root, um, iu = _ctx()
 
     if root.occurrences.count < 2:
         raise Exception("Need at least 2 occurrences/components.")
@@ -774,7 +1088,7 @@ def _rigid_joint_last_two_components(_payload=None):
     occB = root.occurrences.item(root.occurrences.count - 1)
 
     joints = root.asBuiltJoints
-    ji = joints.createInput(occA, occB, adsk.fusion.JointTypes.RigidJointType)
+    ji = joints.createInput(occA, occB, _RIGID_JOINT)
     j = joints.add(ji)
     return {"asBuiltJointName": j.name, "type": "rigid", "A": occA.name, "B": occB.name}
 
@@ -783,44 +1097,104 @@ def _rigid_joint_last_two_components(_payload=None):
 # NEW: gear helpers
 # ======================
 
-def _polar_point(r, ang):
-    return adsk.core.Point3D.create(r * math.cos(ang), r * math.sin(ang), 0)
+# (name, type, default) per argument. _dispatch_tool coerces these on the HTTP thread,
+# so bad input is rejected before anything is queued for Fusion and the builders can
+# index the payload directly.
+_ARG_SPECS = {
+    "create_spur_gear_involute": (
+        ("teeth", int, 24),
+        ("module_mm", float, 2.0),
+        ("pressure_angle_deg", float, 20.0),
+        ("thickness_mm", float, 10.0),
+        ("bore_mm", float, 0.0),
+        ("backlash_mm", float, 0.0),
+    ),
+    "create_rack_gear": (
+        ("module_mm", float, 2.0),
+        ("teeth", int, 12),
+        ("thickness_mm", float, 10.0),
+        ("pressure_angle_deg", float, 20.0),
+    ),
+}
+
+
+def _coerce_args(spec, args):
+    if not isinstance(args, dict):
+        raise ValueError("args must be a JSON object")
+    out = dict(args)
+    for name, typ, default in spec:
+        val = args.get(name, default)
+        v = None
+        # bool is an int subclass; true/false is never a valid count or length.
+        if not isinstance(val, bool):
+            try:
+                f = float(val)
+            except (TypeError, ValueError):
+                f = None
+            # stdlib json parses 1e400 / NaN, so non-finite values are rejected here too.
+            if f is not None and math.isfinite(f):
+                if typ is float:
+                    v = f
+                elif f == int(f):
+                    v = int(f)  # 24, 24.0 and "24" agree; 24.9 is rejected, not truncated
+        if v is None:
+            raise ValueError(f"{name} must be {'an integer' if typ is int else 'a finite number'}, got {val!r}")
+        out[name] = v
+    return out
 
 
 def _involute_points(base_r, r_end, rotation, n=20):
+    """Involute from base_r out to r_end as (ObjectCollection of Point3D, xs, ys).
+
+    Sampled by pressure angle a (t = tan a, r = base_r / cos a), which avoids the
+    per-sample sqrt and atan of the roll-angle form.
+    """
     if r_end <= base_r:
         return None
-    t_end = math.sqrt((r_end / base_r) ** 2 - 1.0)
+    a_end = math.acos(base_r / r_end)
+    if np is not None:
+        a = np.linspace(0.0, a_end, n + 1)
+        c = np.cos(a)
+        r = base_r / c
+        theta = (np.sin(a) / c - a) + rotation
+        xs = (r * np.cos(theta)).tolist()
+        ys = (r * np.sin(theta)).tolist()
+    else:
+        xs = [0.0] * (n + 1)
+        ys = [0.0] * (n + 1)
+        cos, sin = math.cos, math.sin
+        for i in range(n + 1):
+            a = a_end * (i / n)
+            c = cos(a)
+            r = base_r / c
+            theta = (sin(a) / c - a) + rotation
+            xs[i] = r * cos(theta)
+            ys[i] = r * sin(theta)
     pts = adsk.core.ObjectCollection.create()
-    for i in range(n + 1):
-        t = t_end * (i / n)
-        r = base_r * math.sqrt(1 + t * t)
-        theta = (t - math.atan(t)) + rotation
-        pts.add(_polar_point(r, theta))
-    return pts
+    add, p3 = pts.add, _POINT3D
+    for x, y in zip(xs, ys):
+        add(p3(x, y, 0))
+    return pts, xs, ys
 
 
 def _create_spur_gear_involute(payload):
     """
     Approx involute spur gear:
-      - sketch one tooth (two involutes + arcs)
-      - extrude tooth (new body)
-      - circular pattern BODY
-      - combine all
+      - extrude a blank disk (outer radius)
+      - sketch one tooth GAP (involute flanks of two neighbouring teeth + arcs)
+      - extrude-cut the gap
+      - circular pattern the CUT FEATURE (one body, no boolean unions)
       - optional bore cut
     """
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    um = design.unitsManager
+    design, root, um, iu = _ctx()
 
-    z = int(payload.get("teeth", 24))
-    m = float(payload.get("module_mm", 2.0))
-    pa_deg = float(payload.get("pressure_angle_deg", 20.0))
-    thickness_mm = float(payload.get("thickness_mm", 10.0))
-    bore_mm = float(payload.get("bore_mm", 0.0))
-    backlash_mm = float(payload.get("backlash_mm", 0.0))
+    # Already coerced against _ARG_SPECS by _dispatch_tool.
+    z = payload["teeth"]
+    m = payload["module_mm"]
+    pa_deg = payload["pressure_angle_deg"]
+    thickness_mm = payload["thickness_mm"]
+    bore_mm = payload["bore_mm"]
+    backlash_mm = payload["backlash_mm"]
 
     if z < 6:
         raise Exception("teeth must be >= 6")
@@ -846,66 +1220,94 @@ def _create_spur_gear_involute(payload):
     theta_p = (t_p - math.atan(t_p))
     rot = half_thick_angle - theta_p
 
-    sk = root.sketches.add(root.xYConstructionPlane)
-    curves = sk.sketchCurves
-
-    ptsA = _involute_points(base_r, outer_r, rot, n=20)
-    if not ptsA or ptsA.count < 2:
+    # Everything above is mm or unit-free angles; sketch coordinates are internal (cm).
+    base_r *= _MM_TO_INTERNAL
+    outer_r *= _MM_TO_INTERNAL
+    root_r *= _MM_TO_INTERNAL
+    tip_clearance = m * _MM_TO_INTERNAL
+
+    sketches = root.sketches
+    features = root.features
+    extrudes = features.extrudeFeatures
+    xy = root.xYConstructionPlane
+    dist = thickness_mm * _MM_TO_INTERNAL
+
+    # Blank
+    sk_blank = sketches.add(xy)
+    sk_blank.sketchCurves.sketchCircles.addByCenterRadius(_POINT3D(0, 0, 0), outer_r)
+    if sk_blank.profiles.count < 1:
+        raise Exception("No blank profile created.")
+    ext_in = extrudes.createInput(sk_blank.profiles.item(0), _NEW_BODY)
+    ext_in.setDistanceExtent(False, _vi_real(dist))
+    blank = extrudes.add(ext_in).bodies.item(0)
+
+    inv = _involute_points(base_r, outer_r, rot, n=20)
+    if not inv or inv[0].count < 2:
         raise Exception("Failed involute build.")
-    curves.sketchFittedSplines.add(ptsA)
-
-    ptsB = adsk.core.ObjectCollection.create()
-    for i in range(ptsA.count):
-        p = ptsA.item(i)
-        ptsB.add(adsk.core.Point3D.create(p.x, -p.y, 0))
-    curves.sketchFittedSplines.add(ptsB)
-
-    pA_out = ptsA.item(ptsA.count - 1)
-    pB_out = ptsB.item(ptsB.count - 1)
-    pA_in = ptsA.item(0)
-    pB_in = ptsB.item(0)
-
-    # Outer arc (approx)
-    curves.sketchArcs.addByThreePoints(pA_out, _polar_point(outer_r, rot), pB_out)
-    # Root arc (approx)
-    curves.sketchArcs.addByThreePoints(pA_in, _polar_point(root_r, rot), pB_in)
+    ptsA, xs, ys = inv
+
+    # The gap between tooth 0 and tooth 1 is bounded by tooth 0's flank (A) and tooth 1's
+    # flank: A mirrored about X, then rotated one pitch.
+    pitch_ang = 2.0 * math.pi / z
+    gap_mid = pitch_ang / 2.0
+    c1, s1 = math.cos(pitch_ang), math.sin(pitch_ang)
+    cg, sg = math.cos(gap_mid), math.sin(gap_mid)
+    xb = [x * c1 + y * s1 for x, y in zip(xs, ys)]
+    yb = [x * s1 - y * c1 for x, y in zip(xs, ys)]
+
+    sk = sketches.add(xy)
+    curves = sk.sketchCurves
+    sk.isComputeDeferred = True
+    try:
+        curves.sketchFittedSplines.add(ptsA)
+
+        ptsB = adsk.core.ObjectCollection.create()
+        add, p3 = ptsB.add, _POINT3D
+        for x, y in zip(xb, yb):
+            add(p3(x, y, 0))
+        curves.sketchFittedSplines.add(ptsB)
+
+        pA_out = _POINT3D(xs[-1], ys[-1], 0)
+        pB_out = _POINT3D(xb[-1], yb[-1], 0)
+        pA_in = _POINT3D(xs[0], ys[0], 0)
+        pB_in = _POINT3D(xb[0], yb[0], 0)
+
+        # Outer arc bulges past the blank so the cut clears the tip circle
+        curves.sketchArcs.addByThreePoints(pA_out, _POINT3D((outer_r + tip_clearance) * cg, (outer_r + tip_clearance) * sg, 0), pB_out)
+        # Root arc (approx)
+        curves.sketchArcs.addByThreePoints(pA_in, _POINT3D(root_r * cg, root_r * sg, 0), pB_in)
+    finally:
+        sk.isComputeDeferred = False
 
     if sk.profiles.count < 1:
-        raise Exception("No closed tooth profile created.")
-
-    # Extrude tooth
-    dist = um.convert(thickness_mm, "mm", um.internalUnits)
-    extrudes = root.features.extrudeFeatures
-    ext_in = extrudes.createInput(sk.profiles.item(0), adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
-    ext_in.setDistanceExtent(False, adsk.core.ValueInput.createByReal(dist))
-    tooth_ext = extrudes.add(ext_in)
-
-    tooth_body = tooth_ext.bodies.item(0)
-
-    # Pattern tooth body
-    objs = adsk.core.ObjectCollection.create()
-    objs.add(tooth_body)
-
-    pats = root.features.circularPatternFeatures
-    pat_in = pats.createInput(objs, root.zConstructionAxis)
-    pat_in.quantity = adsk.core.ValueInput.createByReal(z)
-    pat_in.totalAngle = adsk.core.ValueInput.createByString("360 deg")
+        raise Exception("No closed tooth-gap profile created.")
+
+    # Cut one gap
+    # Only the blank: other bodies overlapping the gear area must stay untouched.
+    cut_in = extrudes.createInput(sk.profiles.item(0), _CUT)
+    cut_in.setDistanceExtent(False, _vi_real(dist))
+    cut_in.participantBodies = [blank]
+    gap_cut = extrudes.add(cut_in)
+
+    # Pattern the cut feature around Z (instances cut the same participant body)
+    pats = features.circularPatternFeatures
+    pat_in = pats.createInput(_objcoll(gap_cut), root.zConstructionAxis)
+    pat_in.quantity = _vi_real(z)
+    pat_in.totalAngle = _vi_str("360 deg")
     pats.add(pat_in)
 
-    # Combine all bodies
-    _combine_all_bodies({"operation": "join"})
-
     # Bore cut
     
     if bore_mm and bore_mm > 0:
-        sk2 = root.sketches.add(root.xYConstructionPlane)
-        r_bore = um.convert(bore_mm / 2.0, "mm", um.internalUnits)
-        sk2.sketchCurves.sketchCircles.addByCenterRadius(adsk.core.Point3D.create(0, 0, 0), r_bore)
+        sk2 = sketches.add(xy)
+        r_bore = (bore_mm / 2.0) * _MM_TO_INTERNAL
+        sk2.sketchCurves.sketchCircles.addByCenterRadius(_POINT3D(0, 0, 0), r_bore)
 
         if sk2.profiles.count < 1:
             raise Exception("No bore profile.")
-        cut_in = extrudes.createInput(sk2.profiles.item(0), adsk.fusion.FeatureOperations.CutFeatureOperation)
-        cut_in.setDistanceExtent(False, adsk.core.ValueInput.createByString("1000 mm"))
+        cut_in = extrudes.createInput(sk2.profiles.item(0), _CUT)
+        cut_in.setDistanceExtent(False, _vi_str("1000 mm"))
+        cut_in.participantBodies = [blank]
         extrudes.add(cut_in)
 
     return {"gear": "spur_involute_approx", "teeth": z, "module_mm": m, "bodiesCount": root.bRepBodies.count}
@@ -917,16 +1319,13 @@ def _create_rack_gear(payload):
       - sketch a closed polyline rack profile (sawtooth top)
       - extrude
     """
-    design = adsk.fusion.Design.cast(app.activeProduct)
-    if not design:
-        raise Exception("No active Fusion design.")
-    root = design.rootComponent
-    um = design.unitsManager
+    design, root, um, iu = _ctx()
 
-    m = float(payload.get("module_mm", 2.0))
-    teeth = int(payload.get("teeth", 12))
-    thickness_mm = float(payload.get("thickness_mm", 10.0))
-    pa_deg = float(payload.get("pressure_angle_deg", 20.0))
+    # Already coerced against _ARG_SPECS by _dispatch_tool.
+    m = payload["module_mm"]
+    teeth = payload["teeth"]
+    thickness_mm = payload["thickness_mm"]
+    pa_deg = payload["pressure_angle_deg"]
 
     if teeth < 2:
         raise Exception("rack teeth must be >= 2")
@@ -940,54 +1339,91 @@ def _create_rack_gear(payload):
     sk = root.sketches.add(root.xYConstructionPlane)
     lines = sk.sketchCurves.sketchLines
 
-    pts = []
-    pts.append((0, 0))
-    pts.append((teeth * circular_pitch, 0))
-    pts.append((teeth * circular_pitch, base_h))
-
-    for i in range(teeth, 0, -1):
-        xL = (i - 1) * circular_pitch
-        xM = xL + half_pitch
-        pts.append((xM, top_h))
-        pts.append((xL, base_h))
-
-    pts.append((0, base_h))
-    pts.append((0, 0))
-
-    for i in range(len(pts) - 1):
-        p1 = adsk.core.Point3D.create(um.convert(pts[i][0], "mm", um.internalUnits),
-                                      um.convert(pts[i][1], "mm", um.internalUnits), 0)
-        p2 = adsk.core.Point3D.create(um.convert(pts[i+1][0], "mm", um.internalUnits),
-                                      um.convert(pts[i+1][1], "mm", um.internalUnits), 0)
-        lines.addByTwoPoints(p1, p2)
+    # Closed outline: bottom edge, right side, then (tip, root) per tooth right to left, left side.
+    length = teeth * circular_pitch
+    head_x, head_y = [0, length, length], [0, 0, base_h]
+    tail_x, tail_y = [0, 0], [base_h, 0]
+    scale = _MM_TO_INTERNAL
+    if np is not None:
+        arr = np.empty((2, 2 * teeth + 5))
+        arr[:, :3] = head_x, head_y
+        xL = (np.arange(teeth, 0, -1) - 1) * circular_pitch
+        saw = arr[:, 3:-2]
+        saw[0, 0::2] = xL + half_pitch
+        saw[1, 0::2] = top_h
+        saw[0, 1::2] = xL
+        saw[1, 1::2] = base_h
+        arr[:, -2:] = tail_x, tail_y
+        arr *= scale
+        xs, ys = arr.tolist()
+    else:
+        xs, ys = head_x, head_y
+        for i in range(teeth, 0, -1):
+            xL = (i - 1) * circular_pitch
+            xs += (xL + half_pitch, xL)
+            ys += (top_h, base_h)
+        xs += tail_x
+        ys += tail_y
+        xs = [x * scale for x in xs]
+        ys = [y * scale for y in ys]
+
+    # Chain each edge off the previous edge's end SketchPoint so adjacent edges share one
+    # vertex (one Point3D per vertex, no coincident-point merging), and close on the first.
+    # The last vertex repeats the first, so it is closed onto rather than created.
+    add_line, p3 = lines.addByTwoPoints, _POINT3D
+    first = None
+    px, py = xs[0], ys[0]
+    prev = p3(px, py, 0)
+    sk.isComputeDeferred = True
+    try:
+        for x, y in zip(xs[1:-1], ys[1:-1]):
+            if x == px and y == py:
+                continue  # zero-length edge (last root meets the left side)
+            line = add_line(prev, p3(x, y, 0))
+            if first is None:
+                first = line.startSketchPoint
+            prev = line.endSketchPoint
+            px, py = x, y
+        add_line(prev, first)
+    finally:
+        sk.isComputeDeferred = False
 
     if sk.profiles.count < 1:
         raise Exception("No rack profile created.")
 
     extrudes = root.features.extrudeFeatures
-    dist = um.convert(thickness_mm, "mm", um.internalUnits)
-    ext_in = extrudes.createInput(sk.profiles.item(0), adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
-    ext_in.setDistanceExtent(False, adsk.core.ValueInput.createByReal(dist))
+    dist = thickness_mm * _MM_TO_INTERNAL
+    ext_in = extrudes.createInput(sk.profiles.item(0), _NEW_BODY)
+    ext_in.setDistanceExtent(False, _vi_real(dist))
     ext = extrudes.add(ext_in)
 
     return {"gear": "rack_basic", "teeth": teeth, "module_mm": m, "bodiesCount": root.bRepBodies.count}
 
 
+# Registered but not built yet: _dispatch_tool answers these on the HTTP thread
+# instead of queueing a task that can only fail on the Fusion thread.
+_UNIMPLEMENTED = {
+    "create_helical_gear": "Helical gear not implemented yet (needs helix+sweep per tooth).",
+    "create_internal_gear": "Internal gear not implemented yet (needs ring blank + internal tooth cuts).",
+    "create_bevel_gear": "Bevel gear not implemented yet (needs conical geometry + lofted tooth).",
+}
+
+
 def _create_helical_gear(_payload):
-    raise Exception("Helical gear not implemented yet (needs helix+sweep per tooth).")
+    raise Exception(_UNIMPLEMENTED["create_helical_gear"])
 
 
 def _create_internal_gear(_payload):
-    raise Exception("Internal gear not implemented yet (needs ring blank + internal tooth cuts).")
+    raise Exception(_UNIMPLEMENTED["create_internal_gear"])
 
 
 def _create_bevel_gear(_payload):
-    raise Exception("Bevel gear not implemented yet (needs conical geometry + lofted tooth).")
+    raise Exception(_UNIMPLEMENTED["create_bevel_gear"])
 
 
 
 # ---- Tool registry (defined ONCE) ----
-_TOOL_MAP = {
+_TOOL_MAP = types.MappingProxyType({
     "ping": _ping,
     "get_state": _get_state,
     "list_bodies": _list_bodies,
@@ -1006,8 +1442,13 @@ _TOOL_MAP = {
     "extrude_profile": _extrude_profile,
     "revolve_profile": _revolve_profile,
 
+    "box": _box,
+    "cylinder": _cylinder,
+    "tube": _tube,
+
     "hole_on_last_body_top_face": _hole_on_last_body_top_face,
     "hole_bolt_circle_one": _hole_bolt_circle_one,
+    "hole_bolt_circle": _hole_bolt_circle,
     "circular_pattern_last_feature": _circular_pattern_last_feature,
     "countersink_hole_on_last_body_top_face": _countersink_hole_on_last_body_top_face,
         # cleanup / utility
@@ -1025,46 +1466,90 @@ _TOOL_MAP = {
     "create_helical_gear": _create_helical_gear,
     "create_internal_gear": _create_internal_gear,
     "create_bevel_gear": _create_bevel_gear
-}
+})
+# Sent back with unknown-tool errors (serializes as a JSON list).
+_TOOL_NAMES = tuple(_TOOL_MAP)
 
 
 def _dispatch_tool(payload):
     tool = payload.get("tool")
     args = payload.get("args", {}) or {}
-    if tool not in _TOOL_MAP:
-        return {"ok": False, "error": f"Unknown tool '{tool}'.", "available": list(_TOOL_MAP.keys())}
-    return _run_on_fusion_thread(_TOOL_MAP[tool], args)
+    msg = _UNIMPLEMENTED.get(tool)
+    if msg is not None:
+        return {"ok": False, "error": msg}
+    fn = _TOOL_MAP.get(tool)
+    if fn is None:
+        return {"ok": False, "error": f"Unknown tool '{tool}'.", "available": _TOOL_NAMES}
+    if tool in _INLINE_TOOLS:
+        return {"ok": True, "result": fn(args)}
+    spec = _ARG_SPECS.get(tool)
+    if spec is not None:
+        try:
+            args = _coerce_args(spec, args)
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+    timeout = _TOOL_TIMEOUTS.get(tool, DEFAULT_TOOL_TIMEOUT)
+    if tool in READ_ONLY_TOOLS:
+        return _run_coalesced(tool, fn, args, timeout)
+    return _run_on_fusion_thread(lambda p: _run_mutating(fn, p), args, timeout)
 
 
 class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps the socket open so the client's pooled connection is actually reused.
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with _open_conns_lock:
+            _open_conns.add(self.connection)
+
+    def finish(self):
+        with _open_conns_lock:
+            _open_conns.discard(self.connection)
+        super().finish()
+
     def do_GET(self):
         if not _auth_ok(self):
             return _json_response(self, 401, {"ok": False, "error": "unauthorized"})
 
-        if self.path == "/state":
-            res = _run_on_fusion_thread(_get_state, {})
+        url = urlsplit(self.path)
+        if url.path == "/state":
+            # Optional ?fields=designName,bodies limits the sections collected.
+            fields = parse_qs(url.query).get("fields")
+            payload = {"fields": fields[0].split(",")} if fields else {}
+            try:
+                res = _run_coalesced("get_state", _get_state, payload)
+            except Full:
+                return _json_response(self, 503, {"ok": False, "error": "bridge busy, retry later"})
             return _json_response(self, 200, res)
 
-        if self.path == "/ping":
+        if url.path == "/ping":
             return _json_response(self, 200, {"ok": True, "result": {"message": "pong"}})
 
         return _json_response(self, 404, {"ok": False, "error": "not found"})
 
     def do_POST(self):
+        # Unread request bodies would corrupt the next request on a kept-alive socket.
         if not _auth_ok(self):
+            self.close_connection = True
             return _json_response(self, 401, {"ok": False, "error": "unauthorized"})
 
         if self.path != "/tool":
+            self.close_connection = True
             return _json_response(self, 404, {"ok": False, "error": "not found"})
 
         length = int(self.headers.get("Content-Length", "0"))
-        raw = self.rfile.read(length).decode("utf-8") if length > 0 else "{}"
+        # Both parsers take bytes directly (no decode + copy to str first).
+        raw = self.rfile.read(length) if length > 0 else b"{}"
         try:
-            payload = json.loads(raw)
+            payload = orjson.loads(raw) if orjson is not None else json.loads(raw)
         except Exception:
             return _json_response(self, 400, {"ok": False, "error": "invalid json"})
 
-        res = _dispatch_tool(payload)
+        try:
+            res = _dispatch_tool(payload)
+        except Full:
+            return _json_response(self, 503, {"ok": False, "error": "bridge busy, retry later"})
         return _json_response(self, 200, res)
 
     def log_message(self, format, *args):
@@ -1084,7 +1569,9 @@ def start():
     _custom_event.add(on_exec)
     _handlers.append(on_exec)
 
-    _server = HTTPServer((HOST, PORT), _Handler)
+    # One thread per request so concurrent calls only serialize on the Fusion UI thread.
+    _server = ThreadingHTTPServer((HOST, PORT), _Handler)
+    _server.daemon_threads = True
     _server_thread = threading.Thread(target=_server.serve_forever, daemon=True)
     _server_thread.start()
 
@@ -1104,6 +1591,17 @@ def stop():
     except Exception:
         pass
 
+    # Drop kept-alive client connections so pooled clients reconnect to the new instance.
+    with _open_conns_lock:
+        conns = list(_open_conns)
+        _open_conns.clear()
+    for conn in conns:
+        try:
+            conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    _event_pending.clear()
+
     try:
         if app:
             app.unregisterCustomEvent(CUSTOM_EVENT_ID)
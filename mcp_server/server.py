@@ -1,9 +1,16 @@
 import os
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 import httpx
 
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import orjson
+except ImportError:  # optional speedup; httpx's stdlib json is the fallback
+    orjson = None
+
 # Load .env from project root
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 load_dotenv(os.path.join(ROOT, ".env"))
@@ -13,17 +20,43 @@ FUSION_TOKEN = os.getenv("FUSION_BRIDGE_TOKEN", "")
 
 mcp = FastMCP("fusion-mcp")
 
+# One pooled client for all tool calls (keep-alive to the bridge instead of a new
+# connection per request). Created lazily so it binds to the server's event loop.
+_HTTP: httpx.AsyncClient | None = None
+
+def _get_http() -> httpx.AsyncClient:
+    global _HTTP
+    if _HTTP is None:
+        _HTTP = httpx.AsyncClient(
+            base_url=FUSION_URL,
+            headers={"X-Token": FUSION_TOKEN},
+            timeout=30.0,
+        )
+    return _HTTP
+
+async def _close_http() -> None:
+    global _HTTP
+    if _HTTP is not None:
+        await _HTTP.aclose()
+        _HTTP = None
+
+def _json(r: httpx.Response) -> dict:
+    return orjson.loads(r.content) if orjson is not None else r.json()
+
 async def _fusion_get(path: str) -> dict:
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        r = await client.get(f"{FUSION_URL}{path}", headers={"X-Token": FUSION_TOKEN})
-        r.raise_for_status()
-        return r.json()
+    r = await _get_http().get(path)
+    r.raise_for_status()
+    return _json(r)
 
 async def _fusion_post(path: str, payload: dict) -> dict:
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        r = await client.post(f"{FUSION_URL}{path}", json=payload, headers={"X-Token": FUSION_TOKEN})
-        r.raise_for_status()
-        return r.json()
+    if orjson is not None:
+        r = await _get_http().post(
+            path, content=orjson.dumps(payload), headers={"Content-Type": "application/json"}
+        )
+    else:
+        r = await _get_http().post(path, json=payload)
+    r.raise_for_status()
+    return _json(r)
 
 @mcp.tool()
 async def fusion_ping() -> dict:
@@ -55,3 +88,17 @@ async def fusion_extrude_last_profile(distance_mm: float = 5.0, operation: str =
 # ['streamable_http_app', 'run_streamable_http_async', ...]
 # So expose the ASGI app for uvicorn like this:
 app = mcp.streamable_http_app()
+
+# FastMCP's own lifespan runs per MCP session, so the shared client is closed on
+# app shutdown instead, wrapped around the app's existing lifespan.
+_app_lifespan = app.router.lifespan_context
+
+@asynccontextmanager
+async def _lifespan(a):
+    async with _app_lifespan(a):
+        try:
+            yield
+        finally:
+            await _close_http()
+
+app.router.lifespan_context = _lifespan